@@ -1,13 +1,22 @@
 from memprofilerx.tracker import track_memory
-import time
+import threading
+
+SAMPLES_WANTED = 3
+samples_seen = 0
+enough_samples = threading.Event()
 
 def log_to_console(ts, mem):
+    global samples_seen
     print(f"[callback] {ts:.2f}s → {mem:.2f} MB")
+    samples_seen += 1
+    if samples_seen >= SAMPLES_WANTED:
+        enough_samples.set()
 
 @track_memory(interval=1, callback=log_to_console)
 def allocate_and_wait():
-    x = [i for i in range(5_000_000)]
-    time.sleep(3)
+    x = list(range(5_000_000))
+    # Hold the allocation until the sampler has reported it a few times
+    enough_samples.wait(timeout=10)
 
 if __name__ == "__main__":
     allocate_and_wait()
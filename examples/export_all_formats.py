@@ -18,8 +18,8 @@ def simulate_workload() -> None:
     # Phase 1: Gradual memory increase
     print("📈 Phase 1: Allocating memory...")
     data_chunks = []
-    for i in range(5):
-        chunk = [x for x in range(1_000_000)]
+    for _ in range(5):
+        chunk = list(range(1_000_000))
         data_chunks.append(chunk)
         time.sleep(0.5)
 
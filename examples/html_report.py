@@ -17,7 +17,7 @@ def data_processing_pipeline() -> dict[str, int]:
 
     # Stage 2: Data transformation
     print("🔧 Stage 2: Transforming data...")
-    processed_data = {k: v.upper() for k, v in raw_data.items()}
+    processed_data = dict(zip(raw_data, map(str.upper, raw_data.values()), strict=True))
     time.sleep(1)
 
     # Stage 3: Data aggregation
@@ -3,7 +3,7 @@ import time
 
 @track_memory(interval=1)
 def allocate_memory():
-    data = [i for i in range(10_000_000)]
+    data = list(range(10_000_000))
     time.sleep(2)
     return "Complete!"
 
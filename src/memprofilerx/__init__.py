@@ -1,8 +1,12 @@
 """MemProfilerX - Professional Python memory profiler."""
 
-from .reporter import export_to_csv, export_to_html, plot_memory
+from typing import TYPE_CHECKING, Any
+
 from .tracker import analyze_live_objects, global_tracker, track_memory
 
+if TYPE_CHECKING:
+    from .reporter import export_to_csv, export_to_html, plot_memory
+
 __version__ = "0.2.0"
 __all__ = [
     "track_memory",
@@ -12,3 +16,14 @@ __all__ = [
     "export_to_html",
     "export_to_csv",
 ]
+
+_REPORTER_EXPORTS = frozenset({"plot_memory", "export_to_html", "export_to_csv"})
+
+
+def __getattr__(name: str) -> Any:
+    """Import the reporter (NumPy, matplotlib) only when one of its exports is used."""
+    if name in _REPORTER_EXPORTS:
+        from . import reporter
+
+        return getattr(reporter, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -12,7 +12,6 @@ from rich.console import Console
 from rich.logging import RichHandler
 
 from memprofilerx import __version__
-from memprofilerx.reporter import export_to_csv, export_to_html, plot_memory
 from memprofilerx.tracker import global_tracker
 
 app = typer.Typer(
@@ -148,6 +147,8 @@ def convert(
         console.print(f"[red]Error:[/red] Input file not found: {input_file}")
         raise typer.Exit(1)
 
+    from memprofilerx.reporter import export_to_csv, export_to_html, plot_memory
+
     try:
         with open(input_file, encoding="utf-8") as f:
             mem_data = json.load(f)
@@ -1,147 +1,200 @@
 """Memory usage reporting and visualization utilities."""
 
-import csv
+import json
 import logging
-from datetime import datetime
+import time
 from pathlib import Path
 
-import matplotlib
+import numpy as np
 
-matplotlib.use("Agg")  # Use non-GUI backend for Windows/headless environments
-import matplotlib.pyplot as plt  # noqa: E402
-from jinja2 import Template
+try:
+    import orjson
+except ImportError:  # optional speedup, see the "fast" extra
+    _HAS_ORJSON = False
+else:
+    _HAS_ORJSON = True
 
 logger = logging.getLogger(__name__)
 
+# Rendered with str.format_map; literal braces in the CSS and JS are doubled
 HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Memory Profile Report - {{ timestamp }}</title>
+    <title>Memory Profile Report - {timestamp}</title>
     <script src="https://cdn.plot.ly/plotly-2.27.0.min.js"></script>
     <style>
-        * { margin: 0; padding: 0; box-sizing: border-box; }
-        body {
+        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
+        body {{
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI',
                 Roboto, Oxygen, Ubuntu, sans-serif;
             background: #0d1117;
             color: #c9d1d9;
             padding: 2rem;
-        }
-        .container { max-width: 1200px; margin: 0 auto; }
-        h1 { color: #58a6ff; margin-bottom: 0.5rem; }
-        .meta { color: #8b949e; margin-bottom: 2rem; font-size: 0.9rem; }
-        .stats {
+        }}
+        .container {{ max-width: 1200px; margin: 0 auto; }}
+        h1 {{ color: #58a6ff; margin-bottom: 0.5rem; }}
+        .meta {{ color: #8b949e; margin-bottom: 2rem; font-size: 0.9rem; }}
+        .stats {{
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: 1rem;
             margin-bottom: 2rem;
-        }
-        .stat-card {
+        }}
+        .stat-card {{
             background: #161b22;
             border: 1px solid #30363d;
             border-radius: 6px;
             padding: 1rem;
-        }
-        .stat-label { color: #8b949e; font-size: 0.875rem; margin-bottom: 0.25rem; }
-        .stat-value { color: #58a6ff; font-size: 1.5rem; font-weight: 600; }
-        #memoryPlot { width: 100%; height: 500px; margin-bottom: 2rem; }
-        table {
+        }}
+        .stat-label {{ color: #8b949e; font-size: 0.875rem; margin-bottom: 0.25rem; }}
+        .stat-value {{ color: #58a6ff; font-size: 1.5rem; font-weight: 600; }}
+        #memoryPlot {{ width: 100%; height: 500px; margin-bottom: 2rem; }}
+        table {{
             width: 100%;
             border-collapse: collapse;
             background: #161b22;
             border: 1px solid #30363d;
             border-radius: 6px;
             overflow: hidden;
-        }
-        th, td { padding: 0.75rem; text-align: left; border-bottom: 1px solid #30363d; }
-        th { background: #0d1117; color: #58a6ff; font-weight: 600; }
-        tr:last-child td { border-bottom: none; }
-        tr:hover { background: #1c2128; }
+        }}
+        th, td {{ padding: 0.75rem; text-align: left; border-bottom: 1px solid #30363d; }}
+        th {{ background: #0d1117; color: #58a6ff; font-weight: 600; }}
+        tr:last-child td {{ border-bottom: none; }}
+        tr:hover {{ background: #1c2128; }}
+        .pos {{ color: #f85149; }}
+        .neg {{ color: #3fb950; }}
+        .zero {{ color: #8b949e; }}
     </style>
 </head>
 <body>
     <div class="container">
         <h1>🧠 Memory Profile Report</h1>
-        <div class="meta">Generated at {{ timestamp }}</div>
+        <div class="meta">Generated at {timestamp}</div>
 
         <div class="stats">
             <div class="stat-card">
                 <div class="stat-label">Peak Memory</div>
-                <div class="stat-value">{{ peak_memory }} MB</div>
+                <div class="stat-value">{peak_memory} MB</div>
             </div>
             <div class="stat-card">
                 <div class="stat-label">Average Memory</div>
-                <div class="stat-value">{{ avg_memory }} MB</div>
+                <div class="stat-value">{avg_memory} MB</div>
             </div>
             <div class="stat-card">
                 <div class="stat-label">Min Memory</div>
-                <div class="stat-value">{{ min_memory }} MB</div>
+                <div class="stat-value">{min_memory} MB</div>
             </div>
             <div class="stat-card">
                 <div class="stat-label">Duration</div>
-                <div class="stat-value">{{ duration }} s</div>
+                <div class="stat-value">{duration} s</div>
             </div>
             <div class="stat-card">
                 <div class="stat-label">Samples</div>
-                <div class="stat-value">{{ sample_count }}</div>
+                <div class="stat-value">{sample_count}</div>
             </div>
         </div>
 
         <div id="memoryPlot"></div>
 
         <h2 style="margin-bottom: 1rem; color: #58a6ff;">Memory Timeline</h2>
-        <table>
-            <thead>
-                <tr>
-                    <th>Timestamp (s)</th>
-                    <th>Memory (MB)</th>
-                    <th>Delta (MB)</th>
-                </tr>
-            </thead>
-            <tbody>
-                {% for row in table_data %}
-                <tr>
-                    <td>{{ "%.2f"|format(row.timestamp) }}</td>
-                    <td>{{ "%.2f"|format(row.memory) }}</td>
-                    <td style="color: {% if row.delta > 0 %}#f85149{%
-                        elif row.delta < 0 %}#3fb950{% else %}#8b949e{% endif %}">
-                        {{ "%+.2f"|format(row.delta) }}
-                    </td>
-                </tr>
-                {% endfor %}
-            </tbody>
-        </table>
+        <div id="tableContainer">
+            <table>
+                <thead>
+                    <tr>
+                        <th>Timestamp (s)</th>
+                        <th>Memory (MB)</th>
+                        <th>Delta (MB)</th>
+                    </tr>
+                </thead>
+                <tbody id="timelineBody"></tbody>
+            </table>
+            <div id="tableSentinel" style="height: 1px;"></div>
+        </div>
     </div>
 
     <script>
-        const data = [{
-            x: {{ timestamps | tojson }},
-            y: {{ memories | tojson }},
+        const timestamps = {timestamps_json};
+        const memories = {memories_json};
+
+        const data = [{{
+            x: timestamps,
+            y: memories,
             type: 'scatter',
             mode: 'lines+markers',
             name: 'Memory Usage',
-            line: { color: '#58a6ff', width: 2 },
-            marker: { size: 6, color: '#58a6ff' }
-        }];
+            line: {{ color: '#58a6ff', width: 2 }},
+            marker: {{ size: 6, color: '#58a6ff' }}
+        }}];
 
-        const layout = {
+        const layout = {{
             title: 'Memory Usage Over Time',
-            xaxis: { title: 'Time (seconds)', color: '#c9d1d9', gridcolor: '#30363d' },
-            yaxis: { title: 'Memory (MB)', color: '#c9d1d9', gridcolor: '#30363d' },
+            xaxis: {{ title: 'Time (seconds)', color: '#c9d1d9', gridcolor: '#30363d' }},
+            yaxis: {{ title: 'Memory (MB)', color: '#c9d1d9', gridcolor: '#30363d' }},
             paper_bgcolor: '#0d1117',
             plot_bgcolor: '#161b22',
-            font: { color: '#c9d1d9' }
-        };
-
-        Plotly.newPlot('memoryPlot', data, layout, { responsive: true });
+            font: {{ color: '#c9d1d9' }}
+        }};
+
+        Plotly.newPlot('memoryPlot', data, layout, {{ responsive: true }});
+
+        // The timeline table is rendered client-side from the arrays above, one
+        // batch at a time as the sentinel below it scrolls into view, so long
+        // traces don't pay for thousands of DOM rows up front.
+        const ROW_BATCH = 50;
+        const tbody = document.getElementById('timelineBody');
+        const sentinel = document.getElementById('tableSentinel');
+        let rendered = 0;
+
+        function renderRows() {{
+            const end = Math.min(rendered + ROW_BATCH, memories.length);
+            let html = '';
+            for (let i = rendered; i < end; i++) {{
+                const delta = i > 0 ? memories[i] - memories[i - 1] : 0;
+                const cls = delta > 0 ? 'pos' : (delta < 0 ? 'neg' : 'zero');
+                html += '<tr><td>' + timestamps[i].toFixed(2) + '</td><td>'
+                    + memories[i].toFixed(2) + '</td><td class="' + cls + '">'
+                    + (delta >= 0 ? '+' : '') + delta.toFixed(2) + '</td></tr>';
+            }}
+            tbody.insertAdjacentHTML('beforeend', html);
+            rendered = end;
+        }}
+
+        const observer = new IntersectionObserver((entries) => {{
+            if (!entries[0].isIntersecting) return;
+            renderRows();
+            observer.unobserve(sentinel);
+            if (rendered < memories.length) observer.observe(sentinel);
+        }});
+
+        renderRows();
+        if (rendered < memories.length) observer.observe(sentinel);
     </script>
 </body>
 </html>
 """
 
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+_MARKER_MAX_POINTS = 500
+_HIGH_DPI_MAX_POINTS = 2000
+_PLOT_MAX_POINTS = 10000
+_PLOT_SUBSAMPLE_POINTS = 2000
+
+_CSV_BUFFER_SIZE = 1 << 20
+_CSV_CHUNK_ROWS = 65536
+
+
+def _array_json(arr: np.ndarray) -> str:
+    """Serialize a 1-D float array as a JSON list, natively via orjson when installed."""
+    if _HAS_ORJSON:
+        encoded: str = orjson.dumps(arr, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+        return encoded
+    # Compact separators, so the output is identical with or without orjson
+    return json.dumps(arr.tolist(), separators=(",", ":"))
+
 
 def plot_memory(
     mem_data: list[tuple[float, float]],
@@ -168,32 +221,54 @@ def plot_memory(
         raise ValueError("No memory data provided to plot.")
 
     try:
-        timestamps, mem_values = zip(*mem_data, strict=True)
+        arr = np.asarray(mem_data, dtype=np.float64)
+        if arr.ndim != 2 or arr.shape[1] != 2:
+            raise ValueError(f"expected shape (n, 2), got {arr.shape}")
     except (ValueError, TypeError) as e:
         raise ValueError(
             "Memory data format invalid. Expected list of (timestamp, memory_MB) tuples."
         ) from e
+    timestamps = arr[:, 0]
+    mem_values = arr[:, 1]
+
+    # Dense traces: drop per-point markers, lower the DPI and, past
+    # _PLOT_MAX_POINTS, plot an evenly spaced subset that still includes the peak
+    n = len(mem_values)
+    marker = "o" if n < _MARKER_MAX_POINTS else None
+    dpi = 150 if n < _HIGH_DPI_MAX_POINTS else 100
+    if n > _PLOT_MAX_POINTS:
+        idx = np.linspace(0, n - 1, _PLOT_SUBSAMPLE_POINTS, dtype=np.intp)
+        idx = np.union1d(idx, [int(mem_values.argmax())])
+        timestamps = timestamps[idx]
+        mem_values = mem_values[idx]
+
+    # matplotlib is imported here so that importing memprofilerx stays cheap
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
 
     try:
-        plt.figure(figsize=(12, 6))
-        plt.plot(
+        # Draw on an explicit Agg canvas instead of going through pyplot's global
+        # figure manager, so repeated exports leave no state behind
+        fig = Figure(figsize=(12, 6))
+        ax = fig.add_subplot(111)
+        ax.plot(
             timestamps,
             mem_values,
-            marker="o",
+            marker=marker,
             linewidth=2,
-            markersize=4,
+            markersize=4 if marker else 0,
             color="#58a6ff",
         )
-        plt.title(title, fontsize=14, fontweight="bold")
-        plt.xlabel("Time (seconds)", fontsize=11)
-        plt.ylabel("Memory Usage (MB)", fontsize=11)
-        plt.grid(True, alpha=0.3, linestyle="--")
-        plt.tight_layout()
+        ax.set_title(title, fontsize=14, fontweight="bold")
+        ax.set_xlabel("Time (seconds)", fontsize=11)
+        ax.set_ylabel("Memory Usage (MB)", fontsize=11)
+        ax.grid(True, alpha=0.3, linestyle="--")
+        fig.tight_layout()
 
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        plt.savefig(output_path, dpi=150, bbox_inches="tight")
-        plt.close()
+        FigureCanvasAgg(fig)
+        fig.savefig(output_path, dpi=dpi, bbox_inches="tight")
 
         logger.info(f"Memory plot saved to {output_path}")
     except Exception as e:
@@ -226,10 +301,13 @@ def export_to_csv(
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with open(output_path, "w", newline="", encoding="utf-8") as f:
-            writer = csv.writer(f)
-            writer.writerow(["timestamp_seconds", "memory_mb"])
-            writer.writerows(mem_data)
+        with open(output_path, "w", newline="", encoding="utf-8", buffering=_CSV_BUFFER_SIZE) as f:
+            f.write("timestamp_seconds,memory_mb\n")
+            # Rows are plain (float, float) pairs, so skip csv.writer's per-cell
+            # dispatch and format in bounded chunks to cap transient memory
+            for start in range(0, len(mem_data), _CSV_CHUNK_ROWS):
+                chunk = mem_data[start : start + _CSV_CHUNK_ROWS]
+                f.write("".join([f"{t},{m}\n" for t, m in chunk]))
 
         logger.info(f"Memory data exported to CSV: {output_path}")
     except OSError as e:
@@ -246,7 +324,7 @@ def export_to_html(
     Creates a self-contained HTML file with:
     - Interactive Plotly chart
     - Summary statistics (peak, average, min memory)
-    - Detailed data table with deltas
+    - Detailed data table with deltas, rendered incrementally as it is scrolled
 
     Args:
         mem_data: List of (timestamp, memory_in_MB) tuples.
@@ -264,34 +342,27 @@ def export_to_html(
         raise ValueError("No memory data provided to export.")
 
     try:
-        timestamps = [t for t, _ in mem_data]
-        memories = [m for _, m in mem_data]
-
-        # Calculate statistics
-        peak_memory = max(memories)
-        avg_memory = sum(memories) / len(memories)
-        min_memory = min(memories)
-        duration = timestamps[-1] if timestamps else 0
         sample_count = len(mem_data)
+        ts_arr = np.fromiter((t for t, _ in mem_data), dtype=np.float64, count=sample_count)
+        mem_arr = np.fromiter((m for _, m in mem_data), dtype=np.float64, count=sample_count)
 
-        # Prepare table data with deltas
-        table_data = []
-        for i, (timestamp, memory) in enumerate(mem_data):
-            delta = memory - mem_data[i - 1][1] if i > 0 else 0.0
-            table_data.append({"timestamp": timestamp, "memory": memory, "delta": delta})
-
-        # Render template
-        template = Template(HTML_TEMPLATE)
-        html_content = template.render(
-            timestamp=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            peak_memory=f"{peak_memory:.2f}",
-            avg_memory=f"{avg_memory:.2f}",
-            min_memory=f"{min_memory:.2f}",
-            duration=f"{duration:.2f}",
-            sample_count=sample_count,
-            timestamps=timestamps,
-            memories=memories,
-            table_data=table_data,
+        # Calculate statistics
+        peak_memory = mem_arr.max()
+        avg_memory = float(mem_arr.mean())
+        min_memory = mem_arr.min()
+        duration = ts_arr[-1]
+
+        html_content = HTML_TEMPLATE.format_map(
+            {
+                "timestamp": time.strftime(_TIMESTAMP_FORMAT),
+                "peak_memory": f"{peak_memory:.2f}",
+                "avg_memory": f"{avg_memory:.2f}",
+                "min_memory": f"{min_memory:.2f}",
+                "duration": f"{duration:.2f}",
+                "sample_count": sample_count,
+                "timestamps_json": _array_json(ts_arr),
+                "memories_json": _array_json(mem_arr),
+            }
         )
 
         output_path = Path(output_path)
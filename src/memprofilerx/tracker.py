@@ -1,32 +1,521 @@
 """Memory tracking utilities for profiling Python applications."""
 
+import atexit
 import gc
-import json
+import heapq
+import importlib.util
+import itertools
 import logging
+import os
+import queue
+import signal
 import sys
 import threading
 import time
-from collections import defaultdict
+from array import array
+from collections import Counter, defaultdict
 from collections.abc import Callable
 from functools import wraps
 from pathlib import Path
 from typing import Any, ParamSpec, TypeVar
 
 import psutil
-from rich.console import Console
 
-console = Console()
 logger = logging.getLogger(__name__)
 
 P = ParamSpec("P")
 R = TypeVar("R")
 
+_MB = 1.0 / (1024 * 1024)
+_MIN_READ_INTERVAL_NS = 10_000_000
+
+
+def _rss_reader() -> tuple[Callable[[], int], Callable[[], None]]:
+    """
+    Return ``(read, close)`` callables for this process's resident set size in bytes.
+
+    On Linux the RSS is read straight from /proc/self/statm with one ``os.pread``
+    on a descriptor opened once here, which skips psutil's per-call namedtuple
+    and extra parsing, and the seek and file-object layer of a buffered read.
+    Other platforms, or a Linux without a readable /proc, use psutil.
+
+    The shared sampler calls this once per process (again in a forked child),
+    so every tracked call reuses one handle. ``Process.oneshot()`` is not
+    used: it only pays off when several attributes are read together, and
+    while active it caches ``memory_info()``, which would freeze the readings.
+
+    Raises:
+        psutil.NoSuchProcess, psutil.AccessDenied: If the psutil fallback cannot
+            access the current process.
+    """
+    if sys.platform == "linux":
+        try:
+            statm_fd = os.open("/proc/self/statm", os.O_RDONLY)
+        except OSError:
+            pass
+        else:
+            # The page size is a power of two, so pages convert to bytes with a shift
+            page_shift = os.sysconf("SC_PAGE_SIZE").bit_length() - 1
+            pread = os.pread
+
+            def read_statm() -> int:
+                return int(pread(statm_fd, 128, 0).split(b" ", 2)[1]) << page_shift
+
+            return read_statm, lambda: os.close(statm_fd)
+
+    memory_info = psutil.Process().memory_info
+
+    def read_psutil() -> int:
+        rss: int = memory_info().rss
+        return rss
+
+    return read_psutil, lambda: None
+
+
+class _SampleRecorder:
+    """
+    Collect ``(timestamp, memory_MB)`` samples for one tracked call.
+
+    Samples are stored column-wise in two ``array('d')`` buffers, 16 bytes per
+    sample instead of a tuple and two float objects each; :meth:`finish` builds
+    the list of tuples the public API returns once, at the end.
+
+    With a positive ``threshold_mb`` a sample is only kept when it differs from
+    the last kept sample by at least that much, so long steady phases collapse
+    to a handful of points.
+
+    With ``max_samples`` set, the buffer never grows past that many samples:
+    when it fills up, adjacent pairs are merged into whichever has the higher
+    memory, and from then on every ``stride`` incoming samples are folded into
+    one. The trace stays evenly spread over the whole run and keeps its peaks,
+    at a coarser time resolution the longer it runs.
+
+    Whatever was dropped or merged, the last sample passed to :meth:`add` is
+    always the last one :meth:`finish` returns, so the end-of-run reading
+    survives both filters.
+    """
+
+    def __init__(self, threshold_mb: float = 0.0, max_samples: int | None = None) -> None:
+        self.timestamps = array("d")
+        self.memories = array("d")
+        self._threshold_mb = threshold_mb
+        self._max_samples = max_samples
+        self._last_mem: float | None = None
+        self._last_sample: tuple[float, float] | None = None
+        self._stride = 1
+        self._bucket: tuple[float, float] | None = None
+        self._bucket_size = 0
+
+    def add(self, timestamp: float, mem: float) -> bool:
+        """Record a sample and return whether it was kept."""
+        self._last_sample = (timestamp, mem)
+        last_mem = self._last_mem
+        if last_mem is not None and abs(mem - last_mem) < self._threshold_mb:
+            return False
+        self._last_mem = mem
+
+        if self._stride > 1:
+            bucket = self._bucket
+            if bucket is None or mem > bucket[1]:
+                bucket = self._bucket = (timestamp, mem)
+            self._bucket_size += 1
+            if self._bucket_size < self._stride:
+                return True
+            timestamp, mem = bucket
+            self._bucket = None
+            self._bucket_size = 0
+
+        self.timestamps.append(timestamp)
+        self.memories.append(mem)
+        if self._max_samples is not None and len(self.memories) >= self._max_samples:
+            self._compact()
+        return True
+
+    def finish(self) -> list[tuple[float, float]]:
+        """Flush the partial bucket and the final sample; return all samples."""
+        ts, mems = self.timestamps, self.memories
+        if self._bucket is not None:
+            ts.append(self._bucket[0])
+            mems.append(self._bucket[1])
+        self._bucket = None
+        self._bucket_size = 0
+
+        last = self._last_sample
+        if last is not None:
+            # Set the final sample aside so the last compaction can't merge it away
+            if ts and ts[-1] == last[0]:
+                ts.pop()
+                mems.pop()
+            limit = None if self._max_samples is None else self._max_samples - 1
+            while limit is not None and len(self.memories) > limit:
+                self._compact()
+            self.timestamps.append(last[0])
+            self.memories.append(last[1])
+        return list(zip(self.timestamps, self.memories, strict=True))
+
+    def _compact(self) -> None:
+        ts, mems = self.timestamps, self.memories
+        keep = [i if mems[i] >= mems[i + 1] else i + 1 for i in range(0, len(mems) - 1, 2)]
+        if len(mems) % 2:
+            keep.append(len(mems) - 1)
+        self.timestamps = array("d", [ts[i] for i in keep])
+        self.memories = array("d", [mems[i] for i in keep])
+        self._stride *= 2
+
+
+class _Session:
+    """Sampling state of one tracked call, driven by the shared :class:`_SamplerService`."""
+
+    def __init__(
+        self,
+        interval: float,
+        on_sample: Callable[[float, float], bool],
+        on_error: Callable[[Exception], None],
+    ) -> None:
+        self.interval_ns = max(1, round(interval * 1e9))
+        self.on_sample = on_sample
+        self.on_error = on_error
+        self.active = True
+        self.lock = threading.Lock()
+        self.start_ns = 0
+        self.deadline_ns = 0
+        self.stop_timer: Callable[[], None] | None = None
+
+    def sample(self, now_ns: int, mem: float) -> bool:
+        """Deliver one reading taken at ``now_ns``; return whether more are wanted."""
+        with self.lock:
+            if not self.active:
+                return False
+            try:
+                self.active = self.on_sample((now_ns - self.start_ns) * 1e-9, mem)
+            except Exception as e:
+                self.active = False
+                self.on_error(e)
+            return self.active
+
+    def fail(self, error: Exception) -> None:
+        """Stop the session because the shared reading itself failed."""
+        with self.lock:
+            if self.active:
+                self.active = False
+                self.on_error(error)
+
+
+class _SamplerService:
+    """
+    A single daemon thread that samples RSS for every active tracked call.
+
+    Sessions wait in a heap ordered by their next deadline. Each tick reads RSS
+    once and hands the reading to every session that is due, so nested or
+    concurrent tracked calls cost one reading per tick instead of one thread
+    and one reading each. Deadlines advance in whole intervals from the
+    session's start, so the time spent sampling does not accumulate as drift;
+    a session that falls a full interval behind is sampled again right away
+    instead of firing a burst of catch-up samples. The thread is started on
+    first use and blocks on a condition while no session is active.
+
+    All scheduling runs on integer ``time.monotonic_ns()`` values; a sample's
+    timestamp is converted to float seconds once, relative to its session's
+    start, so it stays exact however long the process has been running.
+
+    RSS is read at most once per ``_MIN_READ_INTERVAL_NS``; a sample due sooner
+    than that, from a very short interval or from calls registered in quick
+    succession, reuses the previous reading.
+    """
+
+    def __init__(self) -> None:
+        self._reset()
+
+    def _reset(self) -> None:
+        self._cond = threading.Condition()
+        self._heap: list[tuple[int, int, _Session]] = []
+        self._order = itertools.count()
+        self._thread: threading.Thread | None = None
+        self._read_rss: Callable[[], int] | None = None
+        self._close_rss: Callable[[], None] = lambda: None
+        self._read_lock = threading.Lock()
+        self._last_read_ns: int | None = None
+        self._last_mem = 0.0
+
+    def _after_fork_in_child(self) -> None:
+        # The sampler thread does not survive fork and /proc/self/statm still
+        # points at the parent, so start over with fresh state
+        self._close_rss()
+        self._reset()
+
+    def register(self, session: _Session, use_signal: bool = False) -> None:
+        """
+        Start sampling ``session``, taking its first sample in the calling thread.
+
+        With ``use_signal``, later samples are taken by a ``SIGALRM`` handler
+        driven by ``ITIMER_REAL`` instead of the sampler thread, when that is
+        possible; see :meth:`_start_timer`.
+
+        Raises:
+            psutil.NoSuchProcess, psutil.AccessDenied: If this process's memory
+                cannot be read.
+        """
+        with self._cond:
+            if self._read_rss is None:
+                self._read_rss, self._close_rss = _rss_reader()
+
+        # The first sample is taken synchronously, so even a call that returns
+        # before the sampler thread gets scheduled has its starting point
+        session.start_ns = now = time.monotonic_ns()
+        try:
+            mem = self._read_mb(now)
+        except Exception as e:
+            session.fail(e)
+            return
+        if not session.sample(now, mem):
+            return
+        if use_signal and self._start_timer(session):
+            return
+
+        with self._cond:
+            session.deadline_ns = now + session.interval_ns
+            heapq.heappush(self._heap, (session.deadline_ns, next(self._order), session))
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, daemon=True, name="memprofilerx-sampler"
+                )
+                self._thread.start()
+            self._cond.notify()
+
+    def _start_timer(self, session: _Session) -> bool:
+        """
+        Sample ``session`` from a ``SIGALRM`` handler; return False if unavailable.
+
+        The handler runs in the main thread between bytecodes, so no sampler
+        thread is woken or scheduled. This needs ``signal.setitimer``, the main
+        thread, and an ``ITIMER_REAL`` nobody else is using (which also rules
+        out a second signal-sampled call nested inside the first). The handler
+        never blocks on a lock the interrupted code might hold: a reading taken
+        elsewhere at the same moment is reused and a nested tick is skipped.
+        """
+        if (
+            not hasattr(signal, "setitimer")
+            or threading.current_thread() is not threading.main_thread()
+            or signal.getitimer(signal.ITIMER_REAL) != (0.0, 0.0)
+        ):
+            logger.debug("Signal sampler unavailable, using the sampler thread")
+            return False
+
+        in_handler = False
+
+        def on_alarm(_signum: int, _frame: object) -> None:
+            nonlocal in_handler
+            if in_handler:
+                return
+            in_handler = True
+            try:
+                now = time.monotonic_ns()
+                try:
+                    mem = self._read_mb(now, blocking=False)
+                except Exception as e:
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+                    session.fail(e)
+                    return
+                if not session.sample(now, mem):
+                    signal.setitimer(signal.ITIMER_REAL, 0)
+            finally:
+                in_handler = False
+
+        previous = signal.signal(signal.SIGALRM, on_alarm)
+
+        def stop_timer() -> None:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            signal.signal(signal.SIGALRM, signal.SIG_DFL if previous is None else previous)
+
+        session.stop_timer = stop_timer
+        seconds = session.interval_ns * 1e-9
+        signal.setitimer(signal.ITIMER_REAL, seconds, seconds)
+        return True
+
+    def _read_mb(self, now_ns: int, blocking: bool = True) -> float:
+        """Return RSS in MB, reusing the last reading if it was taken very recently."""
+        if not self._read_lock.acquire(blocking):
+            return self._last_mem
+        try:
+            last_ns = self._last_read_ns
+            if last_ns is not None and now_ns - last_ns < _MIN_READ_INTERVAL_NS:
+                return self._last_mem
+            read_rss = self._read_rss
+            if read_rss is None:
+                raise RuntimeError("RSS reader used before register() opened it")
+            mem = read_rss() * _MB
+            self._last_read_ns = now_ns
+            self._last_mem = mem
+            return mem
+        finally:
+            self._read_lock.release()
+
+    def unregister(self, session: _Session) -> None:
+        """Stop sampling ``session``, waiting for a sample in progress to finish."""
+        if session.stop_timer is not None:
+            # Called from the registering (main) thread, which is the one the
+            # handler interrupts, so the timer must go before taking the lock
+            session.stop_timer()
+            session.stop_timer = None
+        if session.lock.acquire(timeout=5.0):
+            session.active = False
+            session.lock.release()
+        else:
+            session.active = False
+            logger.warning("Sampler did not release the session cleanly")
+        with self._cond:
+            self._cond.notify()
+
+    def _run(self) -> None:
+        cond = self._cond
+        heap = self._heap
+        clock = time.monotonic_ns
+        while True:
+            with cond:
+                while True:
+                    while heap and not heap[0][2].active:
+                        heapq.heappop(heap)
+                    if not heap:
+                        cond.wait()
+                        continue
+                    delay_ns = heap[0][0] - clock()
+                    if delay_ns <= 0:
+                        break
+                    cond.wait(delay_ns * 1e-9)
+                now = clock()
+                due = []
+                while heap and heap[0][0] <= now:
+                    due.append(heapq.heappop(heap)[2])
+
+            try:
+                mem = self._read_mb(now)
+            except Exception as e:
+                for session in due:
+                    session.fail(e)
+                continue
+
+            rescheduled = []
+            for session in due:
+                if session.sample(now, mem):
+                    deadline = session.deadline_ns + session.interval_ns
+                    session.deadline_ns = max(deadline, clock())
+                    rescheduled.append(session)
+            if rescheduled:
+                with cond:
+                    for session in rescheduled:
+                        heapq.heappush(heap, (session.deadline_ns, next(self._order), session))
+
+
+_sampler = _SamplerService()
+
+_LOG_BATCH_SIZE = 64
+_LOG_FLUSH_INTERVAL = 0.1
+_LOG_DRAIN_TIMEOUT = 1.0
+_log_queue: queue.SimpleQueue[str | threading.Event] = queue.SimpleQueue()
+_log_flusher: threading.Thread | None = None
+_log_flusher_lock = threading.Lock()
+
+
+def _log_sample(message: str) -> None:
+    """
+    Queue a per-sample console message for the background log flusher.
+
+    Writing a console line costs far more than taking the sample, so the
+    sampler only enqueues; the flusher thread emits up to ``_LOG_BATCH_SIZE``
+    messages, or whatever arrived within ``_LOG_FLUSH_INTERVAL`` seconds, in a
+    single :func:`_write_console` call. :func:`_drain_log` waits for everything
+    queued so far to be written.
+    """
+    global _log_flusher
+    if _log_flusher is None:
+        with _log_flusher_lock:
+            if _log_flusher is None:
+                _log_flusher = threading.Thread(
+                    target=_flush_log_queue, daemon=True, name="memprofilerx-log-flusher"
+                )
+                _log_flusher.start()
+    _log_queue.put_nowait(message)
+
+
+def _drain_log() -> None:
+    """
+    Block until every message queued so far has been written.
+
+    Called when a tracked call ends and at interpreter exit, so no sample line
+    is lost in the queue of the daemon flusher. The flusher stays the only
+    writer: it is handed a marker and sets it once the messages queued ahead
+    of it are out, which keeps lines in order.
+    """
+    if _log_flusher is None:
+        return
+    drained = threading.Event()
+    _log_queue.put_nowait(drained)
+    if not drained.wait(_LOG_DRAIN_TIMEOUT):
+        logger.debug("Timed out waiting for the sampler log to drain")
+
+
+def _flush_log_queue() -> None:
+    get = _log_queue.get
+    clock = time.monotonic
+    while True:
+        batch: list[str] = []
+        item = get()
+        flush_at = clock() + _LOG_FLUSH_INTERVAL
+        while not isinstance(item, threading.Event):
+            batch.append(item)
+            timeout = flush_at - clock()
+            if len(batch) >= _LOG_BATCH_SIZE or timeout <= 0:
+                break
+            try:
+                item = get(timeout=timeout)
+            except queue.Empty:
+                break
+        if batch:
+            try:
+                _write_console("\n".join(batch))
+            except Exception as e:
+                logger.debug(f"Failed to write sampler log: {e}")
+        if isinstance(item, threading.Event):
+            item.set()
+
+
+def _write_console(message: str) -> None:
+    """
+    Write ``message`` to stderr as-is.
+
+    Messages are plain text, so they skip rich's markup parsing and render
+    pipeline, and importing the tracker no longer pulls in rich at all.
+    """
+    stream = sys.stderr
+    stream.write(message + "\n")
+    stream.flush()
+
+
+def _after_fork_in_child() -> None:
+    global _log_queue, _log_flusher, _log_flusher_lock
+    _sampler._after_fork_in_child()
+    _log_queue = queue.SimpleQueue()
+    _log_flusher = None
+    _log_flusher_lock = threading.Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
+atexit.register(_drain_log)
+
 
 def track_memory(
     interval: float = 1.0,
     duration: float | None = None,
     callback: Callable[[float, float], None] | None = None,
     analyze_gc: bool = False,
+    threshold_mb: float = 0.0,
+    max_samples: int | None = None,
+    verbose: bool = True,
+    log_every_n: int = 1,
+    use_signal_sampler: bool = False,
+    batch_callback: Callable[[list[tuple[float, float]]], None] | None = None,
+    callback_batch_size: int = 64,
 ) -> Callable[[Callable[P, R]], Callable[P, dict[str, Any]]]:
     """
     Decorator to monitor memory usage during function execution.
@@ -36,19 +525,48 @@ def track_memory(
         duration: Max duration to monitor in seconds. If None, monitors until function completes.
         callback: Optional callback called on each sample with (timestamp, memory_in_MB).
         analyze_gc: Whether to include post-execution GC analysis of live objects.
+            The analysis walks every GC-tracked object once, after the function
+            returns; it never runs inside the sampling loop, so its cost does not
+            scale with the number of samples.
+        threshold_mb: Only record a sample when memory moved at least this many MB
+            since the last recorded one; 0 records every sample. The last sample
+            taken is always recorded. Skipped samples are neither printed nor
+            passed to the callbacks.
+        max_samples: Upper bound on the number of recorded samples. Once reached,
+            older samples are merged pairwise (keeping the higher reading) so the
+            trace covers the whole run at a coarser resolution. None means
+            unbounded.
+        verbose: Whether to print recorded samples to stderr.
+        log_every_n: With verbose, print only every Nth recorded sample, starting
+            with the first. Every sample is still recorded; this only thins the
+            output of fast sampling.
+        use_signal_sampler: Take samples from a ``SIGALRM`` interval timer in the
+            main thread instead of the background sampler thread (POSIX only).
+            Falls back to the thread when called off the main thread or while
+            another interval timer is running. Opt-in, because the signal can
+            interrupt blocking calls in C extensions that don't retry on EINTR.
+            ``callback`` and ``batch_callback`` then run inside the signal
+            handler, interrupting the main thread at any point, so they must
+            not take a non-reentrant lock the main thread might be holding.
+        batch_callback: Optional callback called with lists of
+            ``(timestamp, memory_in_MB)`` tuples, ``callback_batch_size`` samples
+            at a time; samples left over when the function returns are delivered
+            in a final, shorter batch. Cheaper than ``callback`` for callbacks
+            that do I/O. Both can be given.
+        callback_batch_size: Number of samples per ``batch_callback`` call.
 
     Returns:
         Decorated function that returns a dict with 'result', 'memory_usage', and
         optionally 'live_objects' keys.
 
     Raises:
-        ValueError: If interval or duration are invalid.
+        ValueError: If interval, duration or another argument is invalid.
         RuntimeError: If memory tracking fails.
 
     Example:
         >>> @track_memory(interval=0.5, analyze_gc=True)
         ... def process_data():
-        ...     return [i for i in range(1000000)]
+        ...     return list(range(1000000))
         >>> result = process_data()
         >>> print(result["memory_usage"])
     """
@@ -56,47 +574,59 @@ def track_memory(
         raise ValueError(f"Interval must be positive, got {interval}")
     if duration is not None and duration <= 0:
         raise ValueError(f"Duration must be positive or None, got {duration}")
+    if threshold_mb < 0:
+        raise ValueError(f"threshold_mb must be non-negative, got {threshold_mb}")
+    if max_samples is not None and max_samples < 2:
+        raise ValueError(f"max_samples must be at least 2 or None, got {max_samples}")
+    if log_every_n < 1:
+        raise ValueError(f"log_every_n must be at least 1, got {log_every_n}")
+    if callback_batch_size < 1:
+        raise ValueError(f"callback_batch_size must be at least 1, got {callback_batch_size}")
 
     def decorator(func: Callable[P, R]) -> Callable[P, dict[str, Any]]:
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> dict[str, Any]:
-            try:
-                process = psutil.Process()
-            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
-                logger.error(f"Failed to access process: {e}")
-                raise RuntimeError(f"Cannot track memory: {e}") from e
-
-            mem_data: list[tuple[float, float]] = []
-            stop_event = threading.Event()
+            recorder = _SampleRecorder(threshold_mb, max_samples)
             monitor_error: Exception | None = None
+            kept = 0
+            pending: list[tuple[float, float]] = []
 
-            def monitor() -> None:
+            def run_callback(fn: Callable[..., None], *payload: object) -> None:
+                try:
+                    fn(*payload)
+                except Exception as e:
+                    logger.warning(f"Callback error: {e}")
+                    if verbose:
+                        _log_sample(f"[memprofilerx] Callback error: {e}")
+
+            def on_sample(timestamp: float, mem: float) -> bool:
+                nonlocal kept, pending
+                if recorder.add(timestamp, mem):
+                    if verbose and kept % log_every_n == 0:
+                        _log_sample(f"[memprofilerx] {timestamp:.1f}s → {mem:.2f} MB")
+                    kept += 1
+
+                    if callback:
+                        run_callback(callback, timestamp, mem)
+                    if batch_callback:
+                        pending.append((timestamp, mem))
+                        if len(pending) >= callback_batch_size:
+                            batch, pending = pending, []
+                            run_callback(batch_callback, batch)
+
+                return not (duration and timestamp >= duration)
+
+            def on_error(e: Exception) -> None:
                 nonlocal monitor_error
-                start_time = time.time()
-                while not stop_event.is_set():
-                    try:
-                        mem = process.memory_info().rss / (1024 * 1024)
-                        timestamp = time.time() - start_time
-                        mem_data.append((timestamp, mem))
-                        console.log(f"[memprofilerx] {timestamp:.1f}s → {mem:.2f} MB")
-
-                        if callback:
-                            try:
-                                callback(timestamp, mem)
-                            except Exception as e:
-                                logger.warning(f"Callback error: {e}")
-                                console.log(f"[memprofilerx] Callback error: {e}")
-
-                        if duration and timestamp >= duration:
-                            break
-                        time.sleep(interval)
-                    except Exception as e:
-                        monitor_error = e
-                        logger.error(f"Monitor thread error: {e}")
-                        break
+                monitor_error = e
+                logger.error(f"Monitor thread error: {e}")
 
-            thread = threading.Thread(target=monitor, daemon=True, name="memprofilerx-monitor")
-            thread.start()
+            session = _Session(interval, on_sample, on_error)
+            try:
+                _sampler.register(session, use_signal_sampler)
+            except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
+                logger.error(f"Failed to access process: {e}")
+                raise RuntimeError(f"Cannot track memory: {e}") from e
 
             try:
                 result = func(*args, **kwargs)
@@ -104,10 +634,12 @@ def track_memory(
                 logger.error(f"Function {func.__name__} raised exception: {e}")
                 raise
             finally:
-                stop_event.set()
-                thread.join(timeout=5.0)
-                if thread.is_alive():
-                    logger.warning("Monitor thread did not terminate cleanly")
+                _sampler.unregister(session)
+                mem_data = recorder.finish()
+                # No more samples arrive once unregistered, so the tail is flushed here
+                if batch_callback and pending:
+                    run_callback(batch_callback, pending)
+                _drain_log()
 
             if monitor_error:
                 raise RuntimeError(f"Memory monitoring failed: {monitor_error}") from monitor_error
@@ -156,14 +688,67 @@ def analyze_live_objects(min_size_kb: int = 100) -> dict[str, dict[str, int | fl
     if min_size_kb < 0:
         raise ValueError(f"min_size_kb must be non-negative, got {min_size_kb}")
 
-    stats: dict[str, dict[str, int]] = defaultdict(lambda: {"count": 0, "total_size": 0})
+    objects = gc.get_objects()
+    # Nothing the tally allocates is cyclic garbage, but a collection triggered
+    # mid-loop would traverse every object in the snapshot it was just handed
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        try:
+            type_counts, type_sizes = _tally_objects(objects)
+        except Exception as e:
+            # An object whose size can't be taken aborts the fast pass; redo it checked
+            logger.debug(f"Falling back to per-object analysis: {e}")
+            type_counts, type_sizes = _tally_objects_checked(objects)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    del objects
+
+    # Distinct types are few, so names are resolved (and same-named types merged) here
+    counts: defaultdict[str, int] = defaultdict(int)
+    sizes: defaultdict[str, int] = defaultdict(int)
+    for obj_type, size in type_sizes.items():
+        type_name = obj_type.__name__
+        counts[type_name] += type_counts[obj_type]
+        sizes[type_name] += size
+
+    threshold = min_size_kb * 1024
+    return {
+        type_name: {"count": counts[type_name], "total_size_kb": round(size / 1024, 2)}
+        for type_name, size in sizes.items()
+        if size > threshold
+    }
+
+
+def _tally_objects(objects: list[Any]) -> tuple[dict[type, int], dict[type, int]]:
+    """
+    Count and size objects per type.
+
+    Tallies are keyed by the type object rather than its name: types hash by
+    identity, so no ``__name__`` lookup happens per object, and the counting pass
+    runs entirely inside ``Counter``'s C loop.
+    """
+    counts = Counter(map(type, objects))
+    sizes: defaultdict[type, int] = defaultdict(int)
+    getsizeof = sys.getsizeof
+    for obj in objects:
+        sizes[type(obj)] += getsizeof(obj)
+    return counts, sizes
+
+
+def _tally_objects_checked(objects: list[Any]) -> tuple[dict[type, int], dict[type, int]]:
+    """Like :func:`_tally_objects`, but skips objects that fail to report a size."""
+    counts: defaultdict[type, int] = defaultdict(int)
+    sizes: defaultdict[type, int] = defaultdict(int)
+    getsizeof = sys.getsizeof
 
-    for obj in gc.get_objects():
+    for obj in objects:
         try:
-            size = sys.getsizeof(obj)
-            type_name = type(obj).__name__
-            stats[type_name]["count"] += 1
-            stats[type_name]["total_size"] += size
+            size = getsizeof(obj)
+            obj_type = type(obj)
+            counts[obj_type] += 1
+            sizes[obj_type] += size
         except (TypeError, AttributeError, ReferenceError):
             # Some objects may not support getsizeof or may be deleted during iteration
             continue
@@ -171,14 +756,7 @@ def analyze_live_objects(min_size_kb: int = 100) -> dict[str, dict[str, int | fl
             logger.debug(f"Unexpected error analyzing object: {e}")
             continue
 
-    return {
-        type_name: {
-            "count": data["count"],
-            "total_size_kb": round(data["total_size"] / 1024, 2),
-        }
-        for type_name, data in stats.items()
-        if data["total_size"] / 1024 > min_size_kb
-    }
+    return counts, sizes
 
 
 def global_tracker(
@@ -186,6 +764,11 @@ def global_tracker(
     export_png: str | Path | None = None,
     export_json: str | Path | None = None,
     export_csv: str | Path | None = None,
+    threshold_mb: float = 0.0,
+    max_samples: int | None = None,
+    verbose: bool = True,
+    log_every_n: int = 1,
+    use_signal_sampler: bool = False,
 ) -> Callable[[Callable[P, R]], Callable[P, R]]:
     """
     Decorator to monitor memory of the entire process during function execution.
@@ -198,14 +781,34 @@ def global_tracker(
         export_png: File path to export memory visualization as PNG image.
         export_json: File path to export raw memory data as JSON.
         export_csv: File path to export memory data as CSV.
+        threshold_mb: Only record a sample when memory moved at least this many MB
+            since the last recorded one; 0 records every sample. The last sample
+            taken is always recorded. Skipped samples are not printed.
+        max_samples: Upper bound on the number of recorded samples. Once reached,
+            older samples are merged pairwise (keeping the higher reading) so the
+            trace covers the whole run at a coarser resolution. None means
+            unbounded.
+        verbose: Whether to print recorded samples to stderr.
+        log_every_n: With verbose, print only every Nth recorded sample, starting
+            with the first. Every sample is still recorded; this only thins the
+            output of fast sampling.
+        use_signal_sampler: Take samples from a ``SIGALRM`` interval timer in the
+            main thread instead of the background sampler thread (POSIX only).
+            Falls back to the thread when called off the main thread or while
+            another interval timer is running. Opt-in, because the signal can
+            interrupt blocking calls in C extensions that don't retry on EINTR.
 
     Returns:
         Decorated function that monitors memory and exports data after execution.
 
     Raises:
-        ValueError: If interval is invalid.
+        ValueError: If interval or another argument is invalid.
+        ImportError: If export_png is set but the reporting dependencies are
+            missing; raised when the decorator is applied.
+        OSError: If an export directory cannot be created; raised when the
+            decorator is applied. Failures writing the exports themselves are
+            logged, not raised.
         RuntimeError: If memory tracking fails critically.
-        IOError: If file export fails.
 
     Example:
         >>> @global_tracker(interval=0.5, export_png="memory.png")
@@ -216,36 +819,40 @@ def global_tracker(
     """
     if interval <= 0:
         raise ValueError(f"Interval must be positive, got {interval}")
+    if threshold_mb < 0:
+        raise ValueError(f"threshold_mb must be non-negative, got {threshold_mb}")
+    if max_samples is not None and max_samples < 2:
+        raise ValueError(f"max_samples must be at least 2 or None, got {max_samples}")
+    if log_every_n < 1:
+        raise ValueError(f"log_every_n must be at least 1, got {log_every_n}")
 
     def decorator(func: Callable[P, R]) -> Callable[P, R]:
+        exporters = _build_exporters(export_png, export_json, export_csv)
+
         @wraps(func)
         def wrapper(*args: P.args, **kwargs: P.kwargs) -> R:
+            recorder = _SampleRecorder(threshold_mb, max_samples)
+            kept = 0
+
+            def on_sample(timestamp: float, mem: float) -> bool:
+                nonlocal kept
+                if recorder.add(timestamp, mem):
+                    if verbose and kept % log_every_n == 0:
+                        _log_sample(f"[global_tracker] {timestamp:.1f}s → {mem:.2f} MB")
+                    kept += 1
+                return True
+
+            def on_error(e: Exception) -> None:
+                logger.error(f"Monitor thread error: {e}")
+                _log_sample(f"[global_tracker] Error: {e}")
+
+            session = _Session(interval, on_sample, on_error)
             try:
-                process = psutil.Process()
+                _sampler.register(session, use_signal_sampler)
             except (psutil.NoSuchProcess, psutil.AccessDenied) as e:
                 logger.error(f"Failed to access process: {e}")
                 raise RuntimeError(f"Cannot track memory: {e}") from e
 
-            mem_data: list[tuple[float, float]] = []
-            stop_event = threading.Event()
-
-            def monitor() -> None:
-                start_time = time.time()
-                while not stop_event.is_set():
-                    try:
-                        mem = process.memory_info().rss / (1024 * 1024)
-                        timestamp = time.time() - start_time
-                        mem_data.append((timestamp, mem))
-                        console.log(f"[global_tracker] {timestamp:.1f}s → {mem:.2f} MB")
-                        time.sleep(interval)
-                    except Exception as e:
-                        logger.error(f"Monitor thread error: {e}")
-                        console.log(f"[global_tracker] Error: {e}")
-                        break
-
-            thread = threading.Thread(target=monitor, daemon=True, name="global-tracker-monitor")
-            thread.start()
-
             try:
                 result = func(*args, **kwargs)
                 return result
@@ -253,49 +860,76 @@ def global_tracker(
                 logger.error(f"Function {func.__name__} raised exception: {e}")
                 raise
             finally:
-                stop_event.set()
-                thread.join(timeout=5.0)
-                if thread.is_alive():
-                    logger.warning("Monitor thread did not terminate cleanly")
+                _sampler.unregister(session)
+                mem_data = recorder.finish()
+                _drain_log()
 
-                # Export data in requested formats
-                if export_png:
+                for fmt, path, export in exporters:
                     try:
-                        from .reporter import plot_memory
-
-                        plot_memory(mem_data, output_path=str(export_png))
-                        logger.info(f"Memory plot exported to {export_png}")
-                    except ImportError as e:
-                        logger.error(f"Could not import plot_memory: {e}")
-                        console.log("[global_tracker] Could not import plot_memory")
+                        export(mem_data)
+                        logger.info(f"Memory data exported to {path}")
                     except Exception as e:
-                        logger.error(f"Failed to export PNG: {e}")
-                        console.log(f"[global_tracker] Failed to export PNG: {e}")
-
-                if export_json:
-                    try:
-                        export_path = Path(export_json)
-                        export_path.parent.mkdir(parents=True, exist_ok=True)
-                        with open(export_path, "w", encoding="utf-8") as f:
-                            json.dump(mem_data, f, indent=2)
-                        logger.info(f"Memory data exported to {export_json}")
-                    except OSError as e:
-                        logger.error(f"Failed to export JSON: {e}")
-                        console.log(f"[global_tracker] Failed to export JSON: {e}")
-
-                if export_csv:
-                    try:
-                        export_path = Path(export_csv)
-                        export_path.parent.mkdir(parents=True, exist_ok=True)
-                        with open(export_path, "w", encoding="utf-8") as f:
-                            f.write("timestamp,memory_mb\n")
-                            for timestamp, mem in mem_data:
-                                f.write(f"{timestamp:.3f},{mem:.2f}\n")
-                        logger.info(f"Memory data exported to {export_csv}")
-                    except OSError as e:
-                        logger.error(f"Failed to export CSV: {e}")
-                        console.log(f"[global_tracker] Failed to export CSV: {e}")
+                        logger.error(f"Failed to export {fmt}: {e}")
+                        _write_console(f"[global_tracker] Failed to export {fmt}: {e}")
 
         return wrapper
 
     return decorator
+
+
+def _build_exporters(
+    export_png: str | Path | None,
+    export_json: str | Path | None,
+    export_csv: str | Path | None,
+) -> list[tuple[str, Path, Callable[[list[tuple[float, float]]], None]]]:
+    """
+    Return ``(format, path, export)`` for each export :func:`global_tracker` was given.
+
+    The export configuration is fixed when the decorator is applied, so paths
+    are resolved, parent directories created and the plotting dependencies checked once
+    here; after each call the wrapper only runs the exporters in this list.
+
+    Raises:
+        ImportError: If export_png is set but the reporting dependencies are missing.
+        OSError: If an export directory cannot be created.
+    """
+    exporters: list[tuple[str, Path, Callable[[list[tuple[float, float]]], None]]] = []
+
+    if export_png:
+        # Checked here, so a missing plotting dependency fails at decoration
+        # instead of being swallowed after the run. plot_memory imports
+        # matplotlib lazily, so only its presence is checked, not imported.
+        from .reporter import plot_memory
+
+        if importlib.util.find_spec("matplotlib") is None:
+            raise ImportError("export_png requires matplotlib, which is not installed")
+
+        png_path = Path(export_png)
+        png_path.parent.mkdir(parents=True, exist_ok=True)
+
+        def write_png(mem_data: list[tuple[float, float]]) -> None:
+            plot_memory(mem_data, output_path=str(png_path))
+
+        exporters.append(("PNG", png_path, write_png))
+
+    if export_json:
+        json_path = Path(export_json)
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+
+        def write_json(mem_data: list[tuple[float, float]]) -> None:
+            rows = ",\n".join(f"  [{t!r}, {m!r}]" for t, m in mem_data)
+            json_path.write_text(f"[\n{rows}\n]\n" if rows else "[]\n", encoding="utf-8")
+
+        exporters.append(("JSON", json_path, write_json))
+
+    if export_csv:
+        csv_path = Path(export_csv)
+        csv_path.parent.mkdir(parents=True, exist_ok=True)
+
+        def write_csv(mem_data: list[tuple[float, float]]) -> None:
+            rows = "".join(f"{t:.3f},{m:.2f}\n" for t, m in mem_data)
+            csv_path.write_text(f"timestamp,memory_mb\n{rows}", encoding="utf-8")
+
+        exporters.append(("CSV", csv_path, write_csv))
+
+    return exporters
@@ -1,5 +1,7 @@
 """Comprehensive tests for memory reporting and visualization."""
 
+import json
+import re
 from pathlib import Path
 
 import pytest
@@ -48,6 +50,15 @@ class TestPlotMemory:
 
         assert output_path.exists()
 
+    def test_large_trace(self, tmp_path: Path) -> None:
+        """Test that dense traces past the subsampling threshold still plot."""
+        large_data = [(i * 0.01, 20.0 + (i % 97) * 0.5) for i in range(20_000)]
+        output_path = tmp_path / "large.png"
+        plot_memory(large_data, output_path)
+
+        assert output_path.exists()
+        assert output_path.stat().st_size > 1000
+
     def test_creates_parent_directories(
         self, sample_memory_data: list[tuple[float, float]], tmp_path: Path
     ) -> None:
@@ -74,6 +85,14 @@ class TestPlotMemory:
         with pytest.raises(ValueError, match="Memory data format invalid"):
             plot_memory(invalid_data, output_path)  # type: ignore
 
+    def test_wrong_column_count_raises_error(self, tmp_path: Path) -> None:
+        """Test that uniformly shaped rows with the wrong width raise ValueError."""
+        invalid_data = [(0.0, 1.0, 2.0), (1.0, 2.0, 3.0)]
+        output_path = tmp_path / "plot.png"
+
+        with pytest.raises(ValueError, match="Memory data format invalid"):
+            plot_memory(invalid_data, output_path)  # type: ignore
+
 
 class TestExportToCSV:
     """Tests for export_to_csv function."""
@@ -178,6 +197,23 @@ class TestExportToHTML:
         assert "Timestamp" in content
         assert "Memory" in content
 
+    def test_html_table_rendered_client_side(
+        self, sample_memory_data: list[tuple[float, float]], tmp_path: Path
+    ) -> None:
+        """Test that table rows come from the embedded arrays, not server-side markup."""
+        output_path = tmp_path / "report.html"
+        export_to_html(sample_memory_data, output_path)
+
+        content = output_path.read_text()
+
+        assert "<td>45.20</td>" not in content
+        assert '<tbody id="timelineBody"></tbody>' in content
+        timestamps = re.search(r"const timestamps = (\[.*?\]);", content)
+        memories = re.search(r"const memories = (\[.*?\]);", content)
+        assert timestamps is not None and memories is not None
+        assert json.loads(timestamps.group(1)) == [t for t, _ in sample_memory_data]
+        assert json.loads(memories.group(1)) == [m for _, m in sample_memory_data]
+
     def test_creates_parent_directories(
         self, sample_memory_data: list[tuple[float, float]], tmp_path: Path
     ) -> None:
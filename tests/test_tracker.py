@@ -1,8 +1,15 @@
 """Comprehensive tests for memory tracking functionality."""
 
+import gc
+import json
+import signal
+import sys
+import threading
 import time
 from pathlib import Path
+from typing import Any
 
+import psutil
 import pytest
 
 from memprofilerx.tracker import analyze_live_objects, global_tracker, track_memory
@@ -24,6 +31,18 @@ class TestTrackMemory:
         assert len(result["memory_usage"]) > 0
         assert all(isinstance(item, tuple) and len(item) == 2 for item in result["memory_usage"])
 
+    def test_samples_match_process_rss(self) -> None:
+        """Test that recorded samples agree with psutil's view of the process RSS."""
+
+        @track_memory(interval=0.1)
+        def dummy() -> float:
+            time.sleep(0.15)
+            return psutil.Process().memory_info().rss / (1024 * 1024)
+
+        result = dummy()
+        last_mem = result["memory_usage"][-1][1]
+        assert abs(last_mem - result["result"]) < 16  # MB
+
     def test_with_gc_analysis(self) -> None:
         """Test tracking with GC analysis enabled."""
 
@@ -66,6 +85,248 @@ class TestTrackMemory:
         last_timestamp = result["memory_usage"][-1][0] if result["memory_usage"] else 0
         assert last_timestamp < 0.5  # Some buffer for timing
 
+    def test_sampling_does_not_drift(self) -> None:
+        """Test that time spent taking a sample is not added on top of the interval."""
+
+        def slow_callback(_timestamp: float, _memory: float) -> None:
+            time.sleep(0.03)
+
+        @track_memory(interval=0.1, callback=slow_callback)
+        def dummy() -> None:
+            time.sleep(0.85)
+
+        timestamps = [t for t, _ in dummy()["memory_usage"]]
+        assert len(timestamps) >= 6
+        spacing = (timestamps[-1] - timestamps[0]) / (len(timestamps) - 1)
+        assert spacing < 0.12  # ~0.13 if the callback time accumulated
+
+    def test_threshold_skips_unchanged_samples(self) -> None:
+        """Test that samples within threshold_mb are dropped except the last one."""
+
+        @track_memory(interval=0.05, threshold_mb=1024)
+        def idle() -> None:
+            time.sleep(0.4)
+
+        samples = idle()["memory_usage"]
+        assert len(samples) == 2
+        assert samples[0][0] < samples[1][0]
+
+    def test_threshold_skips_callback_on_unchanged_samples(self) -> None:
+        """Test that samples dropped by threshold_mb don't reach the callback."""
+        callback_data: list[tuple[float, float]] = []
+
+        @track_memory(
+            interval=0.05,
+            threshold_mb=1024,
+            callback=lambda t, m: callback_data.append((t, m)),
+        )
+        def idle() -> None:
+            time.sleep(0.3)
+
+        samples = idle()["memory_usage"]
+        assert callback_data == samples[:1]
+
+    def test_callback_batches(self) -> None:
+        """Test that batch_callback receives every sample in callback_batch_size batches."""
+        batches: list[list[tuple[float, float]]] = []
+
+        @track_memory(interval=0.02, batch_callback=batches.append, callback_batch_size=4)
+        def dummy() -> None:
+            time.sleep(0.25)
+
+        samples = dummy()["memory_usage"]
+        assert len(batches) >= 2
+        assert all(len(batch) == 4 for batch in batches[:-1])
+        assert 1 <= len(batches[-1]) <= 4
+        assert [s for batch in batches for s in batch] == samples
+
+    def test_invalid_callback_batch_size(self) -> None:
+        """Test that callback_batch_size below 1 raises ValueError."""
+        with pytest.raises(ValueError, match="callback_batch_size must be at least 1"):
+
+            @track_memory(callback_batch_size=0)
+            def dummy() -> None:
+                pass
+
+    def test_max_samples_bounds_history(self) -> None:
+        """Test that max_samples caps the samples while still covering the whole run."""
+
+        @track_memory(interval=0.01, max_samples=8)
+        def busy() -> None:
+            time.sleep(0.5)
+
+        samples = busy()["memory_usage"]
+        timestamps = [t for t, _ in samples]
+        assert 2 <= len(samples) <= 8
+        assert timestamps == sorted(timestamps)
+        assert timestamps[-1] > 0.3
+
+    @pytest.mark.parametrize("max_samples", [2, 3, 5, 8])
+    def test_max_samples_keeps_final_sample(self, max_samples: int) -> None:
+        """Test that compaction never merges away the last sample taken."""
+        from memprofilerx.tracker import _SampleRecorder
+
+        for n in range(1, 40):
+            recorder = _SampleRecorder(max_samples=max_samples)
+            # Falling memory, so every merge would otherwise prefer the earlier sample
+            for i in range(n):
+                recorder.add(float(i), float(n - i))
+            samples = recorder.finish()
+            assert samples[-1] == (float(n - 1), 1.0)
+            assert len(samples) <= max_samples
+
+    def test_invalid_max_samples(self) -> None:
+        """Test that max_samples below 2 raises ValueError."""
+        with pytest.raises(ValueError, match="max_samples must be at least 2"):
+
+            @track_memory(max_samples=1)
+            def dummy() -> None:
+                pass
+
+    def test_invalid_threshold(self) -> None:
+        """Test that a negative threshold raises ValueError."""
+        with pytest.raises(ValueError, match="threshold_mb must be non-negative"):
+
+            @track_memory(threshold_mb=-1.0)
+            def dummy() -> None:
+                pass
+
+    def test_nested_calls_share_one_sampler_thread(self) -> None:
+        """Test that nested tracked calls are all sampled by a single thread."""
+
+        @track_memory(interval=0.05)
+        def inner() -> int:
+            time.sleep(0.2)
+            return sum(t.name == "memprofilerx-sampler" for t in threading.enumerate())
+
+        @track_memory(interval=0.03)
+        def outer() -> dict[str, Any]:
+            time.sleep(0.1)
+            return inner()
+
+        outer_result = outer()
+        inner_result = outer_result["result"]
+        assert inner_result["result"] == 1
+        assert len(inner_result["memory_usage"]) >= 3
+        assert len(outer_result["memory_usage"]) >= 8
+
+    def test_rss_reads_are_rate_limited(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that sampling faster than the minimum read interval reuses readings."""
+        from memprofilerx import tracker
+
+        reads: list[int] = []
+
+        def read_rss() -> int:
+            reads.append(1)
+            return 100 * 1024 * 1024
+
+        monkeypatch.setattr(tracker._sampler, "_read_rss", read_rss)
+        monkeypatch.setattr(tracker._sampler, "_last_read_ns", None)
+
+        @track_memory(interval=0.001)
+        def busy() -> None:
+            time.sleep(0.2)
+
+        samples = busy()["memory_usage"]
+        assert len(samples) > 2 * len(reads)
+        assert all(m == 100.0 for _, m in samples)
+
+    @pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="needs setitimer")
+    def test_signal_sampler(self) -> None:
+        """Test sampling from SIGALRM, restoring the previous handler afterwards."""
+        previous = signal.getsignal(signal.SIGALRM)
+
+        @track_memory(interval=0.02, use_signal_sampler=True)
+        def dummy() -> float:
+            time.sleep(0.2)
+            return signal.getitimer(signal.ITIMER_REAL)[1]
+
+        result = dummy()
+        assert result["result"] == pytest.approx(0.02)
+        assert len(result["memory_usage"]) >= 5
+        assert signal.getitimer(signal.ITIMER_REAL) == (0.0, 0.0)
+        assert signal.getsignal(signal.SIGALRM) is previous
+
+    @pytest.mark.skipif(not hasattr(signal, "setitimer"), reason="needs setitimer")
+    def test_signal_sampler_runs_callbacks_in_handler(self) -> None:
+        """Test that with use_signal_sampler callbacks run in the main thread during the call."""
+        threads: list[threading.Thread] = []
+
+        def callback(_timestamp: float, _memory: float) -> None:
+            threads.append(threading.current_thread())
+
+        @track_memory(interval=0.02, callback=callback, use_signal_sampler=True)
+        def dummy() -> int:
+            time.sleep(0.2)
+            return len(threads)
+
+        assert dummy()["result"] >= 5
+        assert all(thread is threading.main_thread() for thread in threads)
+
+    def test_signal_sampler_falls_back_off_main_thread(self) -> None:
+        """Test that use_signal_sampler in a worker thread uses the sampler thread."""
+        results: list[dict[str, Any]] = []
+
+        @track_memory(interval=0.02, use_signal_sampler=True)
+        def dummy() -> None:
+            time.sleep(0.2)
+
+        worker = threading.Thread(target=lambda: results.append(dummy()))
+        worker.start()
+        worker.join()
+        assert len(results[0]["memory_usage"]) >= 5
+
+    @pytest.mark.parametrize("verbose", [True, False])
+    def test_verbose_controls_sample_logging(
+        self, verbose: bool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that per-sample console messages are only queued when verbose."""
+        messages: list[str] = []
+        monkeypatch.setattr("memprofilerx.tracker._log_sample", messages.append)
+
+        @track_memory(interval=0.05, verbose=verbose)
+        def dummy() -> None:
+            time.sleep(0.15)
+
+        samples = dummy()["memory_usage"]
+        assert len(messages) == (len(samples) if verbose else 0)
+
+    def test_sample_log_drained_on_return(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that every queued sample line is written before the call returns."""
+        written: list[str] = []
+        monkeypatch.setattr(
+            "memprofilerx.tracker._write_console", lambda m: written.extend(m.splitlines())
+        )
+
+        @track_memory(interval=0.05)
+        def dummy() -> None:
+            time.sleep(0.2)
+
+        samples = dummy()["memory_usage"]
+        assert written == [f"[memprofilerx] {t:.1f}s → {m:.2f} MB" for t, m in samples]
+
+    def test_log_every_n_thins_output_only(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that log_every_n prints every Nth sample but records all of them."""
+        messages: list[str] = []
+        monkeypatch.setattr("memprofilerx.tracker._log_sample", messages.append)
+
+        @track_memory(interval=0.02, log_every_n=3)
+        def dummy() -> None:
+            time.sleep(0.2)
+
+        samples = dummy()["memory_usage"]
+        assert len(samples) >= 6
+        assert len(messages) == (len(samples) + 2) // 3
+        assert messages[0].endswith(f"{samples[0][1]:.2f} MB")
+
+    def test_invalid_log_every_n(self) -> None:
+        """Test that log_every_n below 1 raises ValueError."""
+        with pytest.raises(ValueError, match="log_every_n must be at least 1"):
+
+            @track_memory(log_every_n=0)
+            def dummy() -> None:
+                pass
+
     def test_invalid_interval(self) -> None:
         """Test that invalid interval raises ValueError."""
         with pytest.raises(ValueError, match="Interval must be positive"):
@@ -176,6 +437,100 @@ class TestGlobalTracker:
         assert png_path.exists()
         assert csv_path.exists()
 
+    def test_json_and_csv_exports_agree(self, tmp_path: Path) -> None:
+        """Test that the JSON and CSV exports hold the same samples."""
+        json_path = tmp_path / "memory.json"
+        csv_path = tmp_path / "memory.csv"
+
+        @global_tracker(interval=0.05, export_json=json_path, export_csv=csv_path)
+        def dummy() -> None:
+            time.sleep(0.3)
+
+        dummy()
+        samples = json.loads(json_path.read_text())
+        lines = csv_path.read_text().splitlines()
+        assert lines[0] == "timestamp,memory_mb"
+        assert lines[1:] == [f"{t:.3f},{m:.2f}" for t, m in samples]
+        assert all(isinstance(t, float) and isinstance(m, float) for t, m in samples)
+
+    def test_missing_png_dependencies_fail_at_decoration(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that export_png without the reporter raises when decorating."""
+        monkeypatch.setitem(sys.modules, "memprofilerx.reporter", None)
+
+        with pytest.raises(ImportError):
+
+            @global_tracker(export_png=tmp_path / "memory.png")
+            def dummy() -> None:
+                pass
+
+    def test_missing_matplotlib_fails_at_decoration(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that export_png without matplotlib raises when decorating."""
+        monkeypatch.setitem(sys.modules, "matplotlib", None)
+
+        with pytest.raises(ImportError, match="matplotlib"):
+
+            @global_tracker(export_png=tmp_path / "memory.png")
+            def dummy() -> None:
+                pass
+
+    def test_export_directories_created_at_decoration(self, tmp_path: Path) -> None:
+        """Test that export directories exist once the decorator is applied."""
+        png_path = tmp_path / "png" / "memory.png"
+        json_path = tmp_path / "json" / "memory.json"
+        csv_path = tmp_path / "csv" / "memory.csv"
+
+        @global_tracker(
+            interval=0.05, export_png=png_path, export_json=json_path, export_csv=csv_path
+        )
+        def dummy() -> None:
+            time.sleep(0.1)
+
+        paths = (png_path, json_path, csv_path)
+        assert all(path.parent.is_dir() and not path.exists() for path in paths)
+
+        dummy()
+        assert all(path.exists() for path in paths)
+
+    def test_monitor_error_logged_after_samples(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a sampler error is printed after the samples queued before it."""
+        from memprofilerx import tracker
+
+        written: list[str] = []
+        monkeypatch.setattr(tracker, "_write_console", lambda m: written.extend(m.splitlines()))
+        reads: list[int] = []
+
+        def read_rss() -> int:
+            reads.append(1)
+            if len(reads) > 3:
+                raise RuntimeError("read failed")
+            return 100 * 1024 * 1024
+
+        monkeypatch.setattr(tracker._sampler, "_read_rss", read_rss)
+        monkeypatch.setattr(tracker._sampler, "_last_read_ns", None)
+
+        @global_tracker(interval=0.02)
+        def dummy() -> None:
+            time.sleep(0.2)
+
+        dummy()
+        assert len(written) == 4
+        assert written[-1] == "[global_tracker] Error: read failed"
+
+    def test_threshold_export(self, tmp_path: Path) -> None:
+        """Test that threshold_mb thins the exported samples."""
+        json_path = tmp_path / "memory.json"
+
+        @global_tracker(interval=0.05, export_json=json_path, threshold_mb=1024)
+        def idle() -> None:
+            time.sleep(0.4)
+
+        idle()
+        assert len(json.loads(json_path.read_text())) == 2
+
     def test_invalid_interval(self) -> None:
         """Test that invalid interval raises ValueError."""
         with pytest.raises(ValueError, match="Interval must be positive"):
@@ -206,11 +561,38 @@ class TestAnalyzeLiveObjects:
         # Lower threshold should return more types
         assert len(result_low) >= len(result_high)
 
+    def test_unsizeable_objects_are_skipped(self) -> None:
+        """Test that an object whose __sizeof__ fails doesn't break the analysis."""
+
+        class Unsizeable:
+            def __sizeof__(self) -> int:
+                raise RuntimeError("no size")
+
+        _keep = [Unsizeable() for _ in range(10)]
+        _data = [[i] for i in range(10000)]
+
+        result = analyze_live_objects(min_size_kb=1)
+        assert "list" in result
+        assert "Unsizeable" not in result
+
     def test_invalid_min_size(self) -> None:
         """Test that negative min_size raises ValueError."""
         with pytest.raises(ValueError, match="min_size_kb must be non-negative"):
             analyze_live_objects(min_size_kb=-10)
 
+    def test_gc_state_restored(self) -> None:
+        """Test that the collector's enabled state is the same after analysis."""
+        assert gc.isenabled()
+        analyze_live_objects(min_size_kb=1)
+        assert gc.isenabled()
+
+        gc.disable()
+        try:
+            analyze_live_objects(min_size_kb=1)
+            assert not gc.isenabled()
+        finally:
+            gc.enable()
+
     def test_return_format(self) -> None:
         """Test that return format is correct."""
         result = analyze_live_objects(min_size_kb=1)